@@ -126,7 +126,10 @@ def update_animal_details(animal_id: int, **kwargs: Any) -> None:
 def update_habitat_details(habitat_id: int, **kwargs: dict[str, Any]) -> None:
     pass
 
-def update_migration_details(migration_id: int, **kwargs: Any) -> None:
+def update_migration_details(migration_id: int,
+                             current_date: Optional[str] = None,
+                             current_location: Optional[str] = None,
+                             duration: Optional[int] = None) -> None:
     pass
 
 def update_migration_path_details(path_id: int, **kwargs) -> None:
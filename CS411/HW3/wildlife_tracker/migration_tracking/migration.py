@@ -1,18 +1,18 @@
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional
 
+@dataclass
 class Migration:
-    def __init__ (self,
-                  current_date: str,
-                  current_location: str,
-                  migration_id: int,
-                  duration: Optional[int] = None) -> None:
-        self.current_date = current_date
-        self.current_location = current_location
-        self.migration_id = migration_id
-        self.duration = duration
+    current_date: str
+    current_location: str
+    migration_id: int
+    duration: Optional[int] = None
 
-def get_migration_path_details(path_id) -> dict:
+def get_migration_path_details(path_id: int) -> dict[str, Any]:
     pass
 
-def update_migration_details(migration_id: int, **kwargs: Any) -> None:
+def update_migration_details(migration_id: int,
+                             current_date: Optional[str] = None,
+                             current_location: Optional[str] = None,
+                             duration: Optional[int] = None) -> None:
     pass
\ No newline at end of file
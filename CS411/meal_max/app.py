@@ -1,3 +1,7 @@
+import os
+import threading
+import time
+
 from dotenv import load_dotenv
 from flask import Flask, jsonify, make_response, Response, request
 # from flask_cors import CORS
@@ -19,6 +23,9 @@ app = Flask(__name__)
 # Initialize the BattleModel
 battle_model = BattleModel()
 
+# How often (in seconds) the materialized leaderboard is rebuilt
+LEADERBOARD_REFRESH_INTERVAL = float(os.getenv("LEADERBOARD_REFRESH_INTERVAL", "300"))
+
 ####################################################
 #
 # Healthchecks
@@ -306,6 +313,8 @@ def get_leaderboard() -> Response:
 
     Query Parameters:
         - sort (str): The field to sort by ('wins', 'battles', or 'win_pct'). Default is 'wins'.
+        - limit (int): The maximum number of meals to return. Default is 100.
+        - offset (int): The number of top-ranked meals to skip. Default is 0.
 
     Returns:
         JSON response with a sorted leaderboard of meals.
@@ -314,9 +323,11 @@ def get_leaderboard() -> Response:
     """
     try:
         sort_by = request.args.get('sort', 'wins')  # Default sort by wins
-        app.logger.info("Generating leaderboard sorted by %s", sort_by)
+        limit = request.args.get('limit', 100, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        app.logger.info("Generating leaderboard sorted by %s (limit=%d, offset=%d)", sort_by, limit, offset)
 
-        leaderboard_data = kitchen_model.get_leaderboard(sort_by)
+        leaderboard_data = kitchen_model.get_leaderboard(sort_by, limit, offset)
 
         return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
     except Exception as e:
@@ -324,6 +335,39 @@ def get_leaderboard() -> Response:
         return make_response(jsonify({'error': str(e)}), 500)
 
 
+def refresh_leaderboard_periodically() -> None:
+    """
+    Rebuild the leaderboard snapshot every LEADERBOARD_REFRESH_INTERVAL seconds, forever.
+    """
+    while True:
+        time.sleep(LEADERBOARD_REFRESH_INTERVAL)
+        try:
+            kitchen_model.refresh_leaderboard()
+        except Exception as e:
+            app.logger.error(f"Error refreshing leaderboard: {e}")
+
+
+def start_leaderboard_refresh() -> None:
+    """
+    Create the leaderboard table if needed, build the first snapshot and start
+    the background refresh thread.
+
+    WSGI servers do not run this module as __main__ and should call this once
+    per worker process after it starts.
+    """
+    try:
+        kitchen_model.create_leaderboard_table()
+        kitchen_model.refresh_leaderboard()
+    except Exception as e:
+        app.logger.error(f"Error refreshing leaderboard: {e}")
+
+    # The debug reloader runs this module twice; only the child process that
+    # actually serves requests keeps refreshing
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=refresh_leaderboard_periodically, daemon=True).start()
+
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.debug = True
+    start_leaderboard_refresh()
+    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -1,8 +1,10 @@
 import logging
+import math
 from typing import List
 
 from meal_max.models.kitchen_model import Meal, update_meal_stats
 from meal_max.utils.logger import configure_logger
+from meal_max.utils.sql_utils import batched_writes
 from meal_max.utils.random_utils import get_random
 
 
@@ -81,9 +83,11 @@ class BattleModel:
         # Log the winner
         logger.info("The winner is: %s", winner.meal)
 
-        # Update stats for both combatants
-        update_meal_stats(winner.id, 'win')
-        update_meal_stats(loser.id, 'loss')
+        # Update stats for both combatants in one commit; without a time limit the
+        # group cannot be committed between the two updates
+        with batched_writes(max_delay=math.inf):
+            update_meal_stats(winner.id, 'win')
+            update_meal_stats(loser.id, 'loss')
 
         # Remove the losing combatant from combatants
         self.combatants.remove(loser)
@@ -150,5 +154,6 @@ class BattleModel:
 
         self.combatants.append(combatant_data)
 
-        # Log the current state of combatants
-        logger.info("Current combatants list: %s", [combatant.meal for combatant in self.combatants])
\ No newline at end of file
+        # Log the current state of combatants, only building the list of names if it will be logged
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Current combatants list: %s", [combatant.meal for combatant in self.combatants])
\ No newline at end of file
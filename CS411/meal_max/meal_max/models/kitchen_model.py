@@ -1,10 +1,14 @@
 from dataclasses import dataclass
+from itertools import chain
 import logging
 import os
 import sqlite3
-from typing import Any
+import threading
+from typing import Any, Optional
 
-from meal_max.utils.sql_utils import get_db_connection
+from cachetools import TTLCache
+
+from meal_max.utils.sql_utils import call_after_commit, get_db_connection, immediate_transaction, in_batched_writes
 from meal_max.utils.logger import configure_logger
 
 
@@ -12,7 +16,72 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-@dataclass
+_ALLOWED_DIFFICULTIES: frozenset[str] = frozenset({'LOW', 'MED', 'HIGH'})
+_BATTLE_RESULTS: frozenset[str] = frozenset({'win', 'loss'})
+
+# rows per multi-row INSERT: 4 parameters each keeps a statement well under
+# SQLite's default limit of 999 bound parameters
+_BULK_INSERT_CHUNK_SIZE = 125
+
+# loads at least this large refresh the planner statistics for the meals table
+_ANALYZE_MIN_ROWS = 1000
+
+# read-through cache of meals by id, plus a name -> id index so that a lookup
+# by name still misses once the meal's id entry has been invalidated
+_MEAL_CACHE_SIZE = 10_000
+_MEAL_CACHE_TTL = 60
+_meals_by_id: TTLCache = TTLCache(maxsize=_MEAL_CACHE_SIZE, ttl=_MEAL_CACHE_TTL)
+_meal_ids_by_name: TTLCache = TTLCache(maxsize=_MEAL_CACHE_SIZE, ttl=_MEAL_CACHE_TTL)
+_meal_cache_lock = threading.Lock()
+# bumped by every invalidation, so a lookup that read the database before a
+# concurrent delete does not put the stale meal back into the cache
+_meal_cache_generation = 0
+
+# contents of the create table scripts, read on first use
+_CREATE_TABLE_SCRIPT: Optional[str] = None
+_CREATE_LEADERBOARD_SCRIPT: Optional[str] = None
+
+# SQL text is kept in constants so that every call hits the same entry in
+# sqlite3's per-connection prepared statement cache
+_SQL_INSERT_MEALS = "INSERT INTO meals (meal, cuisine, price, difficulty) VALUES "
+_SQL_INSERT_MEAL_ROW = "(?, ?, ?, ?)"
+# duplicate names are skipped rather than raised, and show up as missing RETURNING rows
+_SQL_INSERT_MEALS_ON_CONFLICT = " ON CONFLICT(meal) DO NOTHING RETURNING meal"
+_SQL_INSERT_MEALS_CHUNK = (
+    _SQL_INSERT_MEALS
+    + ",".join([_SQL_INSERT_MEAL_ROW] * _BULK_INSERT_CHUNK_SIZE)
+    + _SQL_INSERT_MEALS_ON_CONFLICT
+)
+_SQL_ANALYZE_MEALS = "ANALYZE meals"
+_SQL_DELETE_MEAL = "UPDATE meals SET deleted = 1 WHERE id = ? AND deleted = 0"
+_SQL_MEAL_EXISTS = "SELECT 1 FROM meals WHERE id = ?"
+_SQL_MEAL_NAME_EXISTS = "SELECT 1 FROM meals WHERE meal = ?"
+_SQL_GET_BY_ID = "SELECT id, meal, cuisine, price, difficulty FROM meals WHERE id = ? AND deleted = 0"
+_SQL_GET_BY_NAME = "SELECT id, meal, cuisine, price, difficulty FROM meals WHERE meal = ? AND deleted = 0"
+_SQL_CLEAR_LEADERBOARD = "DELETE FROM meal_leaderboard"
+_SQL_FILL_LEADERBOARD = """
+    INSERT INTO meal_leaderboard (id, meal, cuisine, price, difficulty, battles, wins, win_pct)
+    SELECT id, meal, cuisine, price, difficulty, battles, wins, ROUND(wins * 100.0 / battles, 1)
+    FROM meals WHERE deleted = 0 AND battles > 0
+"""
+_SQL_GET_LEADERBOARD = """
+    SELECT id, meal, cuisine, price, difficulty, battles, wins, win_pct
+    FROM meal_leaderboard ORDER BY {column} DESC, id
+    LIMIT ? OFFSET ?
+"""
+# the complete leaderboard query for each allowed sort_by value, built once
+_LEADERBOARD_SQL = {
+    sort_by: _SQL_GET_LEADERBOARD.format(column=sort_by)
+    for sort_by in ("wins", "win_pct")
+}
+_SQL_UPDATE_STATS = """
+    UPDATE meals SET battles = battles + 1, wins = wins + ?
+    WHERE id = ? AND deleted = 0
+    RETURNING id
+"""
+
+
+@dataclass(frozen=True)
 class Meal:
     """A class to manage a meal and its properties.
 
@@ -27,6 +96,9 @@ class Meal:
         ValueError: If the price is negative or difficulty is not one of the allowed values.
 
     """
+    # Declared by hand because dataclass(slots=True) needs Python 3.10 and the image runs 3.9
+    __slots__ = ('id', 'meal', 'cuisine', 'price', 'difficulty')
+
     id: int
     meal: str
     cuisine: str
@@ -41,9 +113,70 @@ class Meal:
         """
         if self.price < 0:
             raise ValueError("Price must be a positive value.")
-        if self.difficulty not in ['LOW', 'MED', 'HIGH']:
+        if self.difficulty not in _ALLOWED_DIFFICULTIES:
             raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
 
+    # dataclass(slots=True) generates these on 3.10+; without them copy and pickle
+    # fail, because restoring the slots goes through the frozen __setattr__
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+def _cache_get_by_id(meal_id: int) -> Optional[Meal]:
+    with _meal_cache_lock:
+        return _meals_by_id.get(meal_id)
+
+def _cache_get_by_name(meal_name: str) -> Optional[Meal]:
+    with _meal_cache_lock:
+        meal_id = _meal_ids_by_name.get(meal_name)
+        return None if meal_id is None else _meals_by_id.get(meal_id)
+
+def _cache_generation() -> int:
+    with _meal_cache_lock:
+        return _meal_cache_generation
+
+def _cache_put(meal: Meal, generation: int) -> None:
+    # a lookup inside batched_writes() may have read a write that is later rolled back
+    if in_batched_writes():
+        return
+    with _meal_cache_lock:
+        if generation != _meal_cache_generation:
+            return
+        _meals_by_id[meal.id] = meal
+        _meal_ids_by_name[meal.meal] = meal.id
+
+def _cache_invalidate(meal_id: int) -> None:
+    global _meal_cache_generation
+
+    with _meal_cache_lock:
+        _meal_cache_generation += 1
+        _meals_by_id.pop(meal_id, None)
+
+def _cache_clear() -> None:
+    global _meal_cache_generation
+
+    with _meal_cache_lock:
+        _meal_cache_generation += 1
+        _meals_by_id.clear()
+        _meal_ids_by_name.clear()
+
+
+def _validate_meal_fields(price: float, difficulty: str) -> None:
+    """Checks the price and difficulty of a meal before it is written to the database.
+
+    Raises:
+        ValueError: If the price is not a positive number or difficulty is not one of the allowed values.
+
+    """
+    if not isinstance(price, (int, float)) or price <= 0:
+        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
+    if difficulty not in _ALLOWED_DIFFICULTIES:
+        raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
+
 
 def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
     """Creates a new meal to the database with specified attributes.
@@ -59,44 +192,138 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
         sqlite3.Error: If any other database error occurs during insertion.
 
     """
-    if not isinstance(price, (int, float)) or price <= 0:
-        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
-    if difficulty not in ['LOW', 'MED', 'HIGH']:
-        raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
+    create_meals_bulk([(meal, cuisine, price, difficulty)])
+
+def create_meals_bulk(meals: list[tuple[str, str, float, str]]) -> None:
+    """Creates several meals in a single transaction, inserting them in chunks of multi-row INSERTs.
+
+    Either every meal is added or, if any of them fails, none of them are.
+
+    Args:
+        meals (list[tuple[str, str, float, str]]): The meals to add as (meal, cuisine, price, difficulty) tuples.
+
+    Raises:
+        ValueError: If any price is negative, any difficulty is not one of the allowed values, or a meal with the same name already exists in the database or appears twice in the batch.
+        sqlite3.Error: If any other database error occurs during insertion.
+
+    """
+    for _, _, price, difficulty in meals:
+        _validate_meal_fields(price, difficulty)
+
+    if not meals:
+        return
 
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO meals (meal, cuisine, price, difficulty)
-                VALUES (?, ?, ?, ?)
-            """, (meal, cuisine, price, difficulty))
-            conn.commit()
+            with immediate_transaction(conn):
+                for start in range(0, len(meals), _BULK_INSERT_CHUNK_SIZE):
+                    chunk = meals[start:start + _BULK_INSERT_CHUNK_SIZE]
+                    if len(chunk) == _BULK_INSERT_CHUNK_SIZE:
+                        query = _SQL_INSERT_MEALS_CHUNK
+                    else:
+                        query = (
+                            _SQL_INSERT_MEALS
+                            + ",".join([_SQL_INSERT_MEAL_ROW] * len(chunk))
+                            + _SQL_INSERT_MEALS_ON_CONFLICT
+                        )
+                    inserted = conn.execute(query, list(chain.from_iterable(chunk))).fetchall()
+
+                    if len(inserted) < len(chunk):
+                        # Raising inside the transaction rolls back every chunk inserted so far
+                        meal = _find_duplicate_meal(chunk, {row[0] for row in inserted})
+                        logger.error("Duplicate meal name: %s", meal)
+                        raise ValueError(f"Meal with name '{meal}' already exists")
+
+                if len(meals) >= _ANALYZE_MIN_ROWS:
+                    # Refresh the planner statistics while the write lock is still held, so
+                    # this cannot fail with SQLITE_BUSY once the meals are already committed
+                    conn.execute(_SQL_ANALYZE_MEALS)
+
+            logger.info("%d meal(s) successfully added to the database", len(meals))
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+def _find_duplicate_meal(chunk: list[tuple[str, str, float, str]], inserted: set[str]) -> str:
+    """Returns the first meal name in a chunk that the INSERT skipped as a duplicate.
+
+    """
+    seen = set()
+    for meal, *_ in chunk:
+        if meal not in inserted or meal in seen:
+            return meal
+        seen.add(meal)
+    return chunk[-1][0]
 
-            logger.info("Meal successfully added to the database: %s", meal)
+def _get_create_table_script() -> str:
+    """Returns the create table script, reading it from disk only the first time.
 
-    except sqlite3.IntegrityError:
-        logger.error("Duplicate meal name: %s", meal)
-        raise ValueError(f"Meal with name '{meal}' already exists")
+    """
+    global _CREATE_TABLE_SCRIPT
+
+    if _CREATE_TABLE_SCRIPT is None:
+        with open(os.getenv("SQL_CREATE_TABLE_PATH", "/app/sql/create_meal_table.sql"), "r") as fh:
+            _CREATE_TABLE_SCRIPT = fh.read()
+    return _CREATE_TABLE_SCRIPT
+
+def _get_create_leaderboard_script() -> str:
+    """Returns the leaderboard create script, reading it from disk only the first time.
+
+    """
+    global _CREATE_LEADERBOARD_SCRIPT
+
+    if _CREATE_LEADERBOARD_SCRIPT is None:
+        with open(os.getenv("SQL_CREATE_LEADERBOARD_PATH", "/app/sql/create_leaderboard_table.sql"), "r") as fh:
+            _CREATE_LEADERBOARD_SCRIPT = fh.read()
+    return _CREATE_LEADERBOARD_SCRIPT
+
+def create_leaderboard_table() -> None:
+    """Creates the meal_leaderboard table if the database does not have it yet.
+
+    Databases created before the leaderboard existed get the table this way without
+    being recreated. The leaderboard stays empty until the next refresh_leaderboard().
+
+    Raises:
+        RuntimeError: If called inside batched_writes().
+        sqlite3.Error: If any database error occurs.
+
+    """
+    if in_batched_writes():
+        # executescript() would commit the batch's open group along with it
+        raise RuntimeError("create_leaderboard_table() cannot be called inside batched_writes()")
+
+    try:
+        create_leaderboard_script = _get_create_leaderboard_script()
+        with get_db_connection() as conn:
+            conn.executescript(f"BEGIN IMMEDIATE;\n{create_leaderboard_script}\nCOMMIT;")
+
+            logger.info("Leaderboard table is ready.")
 
     except sqlite3.Error as e:
-        logger.error("Database error: %s", str(e))
+        logger.error("Database error while creating the leaderboard table: %s", str(e))
         raise e
 
 def clear_meals() -> None:
-    """Recreates the meals table, effectively deleting all meals.
+    """Recreates the meals and leaderboard tables, effectively deleting all meals.
 
     Raises:
+        RuntimeError: If called inside batched_writes().
         sqlite3.Error: If any database error occurs.
 
     """
+    if in_batched_writes():
+        # executescript() would commit the batch's open group along with it
+        raise RuntimeError("clear_meals() cannot be called inside batched_writes()")
+
     try:
-        with open(os.getenv("SQL_CREATE_TABLE_PATH", "/app/sql/create_meal_table.sql"), "r") as fh:
-            create_table_script = fh.read()
+        create_table_script = _get_create_table_script()
+        create_leaderboard_script = _get_create_leaderboard_script()
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.executescript(create_table_script)
-            conn.commit()
+            # executescript() commits any open transaction before it runs, so the
+            # transaction has to be opened and closed by the script itself
+            conn.executescript(f"BEGIN IMMEDIATE;\n{create_table_script}\n{create_leaderboard_script}\nCOMMIT;")
+            _cache_clear()
 
             logger.info("Meals cleared successfully.")
 
@@ -117,19 +344,20 @@ def delete_meal(meal_id: int) -> None:
     """
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
+            cursor = conn.execute(_SQL_DELETE_MEAL, (meal_id,))
+
+            if cursor.rowcount == 0:
+                # Nothing was updated, so the meal is either missing or already deleted
+                if conn.execute(_SQL_MEAL_EXISTS, (meal_id,)).fetchone():
                     logger.info("Meal with ID %s has already been deleted", meal_id)
                     raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
                 logger.info("Meal with ID %s not found", meal_id)
                 raise ValueError(f"Meal with ID {meal_id} not found")
 
-            cursor.execute("UPDATE meals SET deleted = TRUE WHERE id = ?", (meal_id,))
-            conn.commit()
+            _cache_invalidate(meal_id)
+            # inside batched_writes() another thread can still read and cache the live
+            # row until the delete is committed, so invalidate again at that point
+            call_after_commit(lambda: _cache_invalidate(meal_id))
 
             logger.info("Meal with ID %s marked as deleted.", meal_id)
 
@@ -137,52 +365,62 @@ def delete_meal(meal_id: int) -> None:
         logger.error("Database error: %s", str(e))
         raise e
 
-def get_leaderboard(sort_by: str="wins") -> dict[str, Any]:
+def refresh_leaderboard() -> None:
+    """Rebuilds the meal_leaderboard table from the current battle statistics in the meals table.
+
+    This is meant to run on a schedule; get_leaderboard() only reads the last refreshed snapshot.
+
+    Raises:
+        sqlite3.Error: If any database error occurs during the refresh.
+
+    """
+    try:
+        with get_db_connection() as conn:
+            with immediate_transaction(conn):
+                conn.execute(_SQL_CLEAR_LEADERBOARD)
+                conn.execute(_SQL_FILL_LEADERBOARD)
+
+            logger.info("Leaderboard refreshed successfully")
+
+    except sqlite3.Error as e:
+        logger.error("Database error while refreshing leaderboard: %s", str(e))
+        raise e
+
+def get_leaderboard(sort_by: str="wins", limit: int=100, offset: int=0) -> dict[str, Any]:
     """Retrieves the leaderboard of meals based on battles and wins, sorted by the specified criterion.
 
+    The leaderboard is read from the snapshot built by the last call to refresh_leaderboard().
+
     Args:
         sort_by (str): The field to sort the leaderboard by that must be either "wins" or "win_pct".
+        limit (int): The maximum number of meals to return.
+        offset (int): The number of top-ranked meals to skip, for paging through the leaderboard.
 
     Returns:
         dict[str, Any]: A dictionary containing a list of meals with their details including 'id', 'meal', 'cuisine', 'price', 'difficulty', 'battles', 'wins', and 'win_pct'.
 
     Raises:
-        ValueError: If the 'sort_by' parameter is not "wins" or "win_pct".
+        ValueError: If the 'sort_by' parameter is not "wins" or "win_pct", or 'limit' or 'offset' is negative.
         sqlite3.Error: If any database error occurs during the retrieval process.
 
     """
-    query = """
-        SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct
-        FROM meals WHERE deleted = false AND battles > 0
-    """
-
-    if sort_by == "win_pct":
-        query += " ORDER BY win_pct DESC"
-    elif sort_by == "wins":
-        query += " ORDER BY wins DESC"
-    else:
+    try:
+        query = _LEADERBOARD_SQL[sort_by]
+    except KeyError:
         logger.error("Invalid sort_by parameter: %s", sort_by)
-        raise ValueError("Invalid sort_by parameter: %s" % sort_by)
+        raise ValueError("Invalid sort_by parameter: %s" % sort_by) from None
+
+    if limit < 0 or offset < 0:
+        logger.error("Invalid leaderboard page: limit=%s, offset=%s", limit, offset)
+        raise ValueError(f"Invalid leaderboard page: limit and offset must be non-negative, got {limit} and {offset}")
 
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-        leaderboard = []
-        for row in rows:
-            meal = {
-                'id': row[0],
-                'meal': row[1],
-                'cuisine': row[2],
-                'price': row[3],
-                'difficulty': row[4],
-                'battles': row[5],
-                'wins': row[6],
-                'win_pct': round(row[7] * 100, 1)  # Convert to percentage
-            }
-            leaderboard.append(meal)
+        with get_db_connection(read_only=True) as conn:
+            cursor = conn.execute(query, (limit, offset))
+
+            # Rows come back as sqlite3.Row, so they convert to dicts keyed by column name;
+            # win_pct is already stored as a rounded percentage
+            leaderboard = [dict(row) for row in cursor]
 
         logger.info("Leaderboard retrieved successfully")
         return leaderboard
@@ -205,20 +443,27 @@ def get_meal_by_id(meal_id: int) -> Meal:
         sqlite3.Error: If a database error occurs during the retrieval process.
 
     """
+    meal = _cache_get_by_id(meal_id)
+    if meal is not None:
+        return meal
+    generation = _cache_generation()
+
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?", (meal_id,))
-            row = cursor.fetchone()
+        with get_db_connection(read_only=True) as conn:
+            row = conn.execute(_SQL_GET_BY_ID, (meal_id,)).fetchone()
 
             if row:
-                if row[5]:
-                    logger.info("Meal with ID %s has been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
-            else:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
+                id_, name, cuisine, price, difficulty = row
+                meal = Meal(id=id_, meal=name, cuisine=cuisine, price=price, difficulty=difficulty)
+                _cache_put(meal, generation)
+                return meal
+
+            # Only live meals match above, so check whether the meal exists at all
+            if conn.execute(_SQL_MEAL_EXISTS, (meal_id,)).fetchone():
+                logger.info("Meal with ID %s has been deleted", meal_id)
+                raise ValueError(f"Meal with ID {meal_id} has been deleted")
+            logger.info("Meal with ID %s not found", meal_id)
+            raise ValueError(f"Meal with ID {meal_id} not found")
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
@@ -239,20 +484,27 @@ def get_meal_by_name(meal_name: str) -> Meal:
         sqlite3.Error: If a database error occurs during the retrieval process.
 
     """
+    meal = _cache_get_by_name(meal_name)
+    if meal is not None:
+        return meal
+    generation = _cache_generation()
+
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?", (meal_name,))
-            row = cursor.fetchone()
+        with get_db_connection(read_only=True) as conn:
+            row = conn.execute(_SQL_GET_BY_NAME, (meal_name,)).fetchone()
 
             if row:
-                if row[5]:
-                    logger.info("Meal with name %s has been deleted", meal_name)
-                    raise ValueError(f"Meal with name {meal_name} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
-            else:
-                logger.info("Meal with name %s not found", meal_name)
-                raise ValueError(f"Meal with name {meal_name} not found")
+                id_, name, cuisine, price, difficulty = row
+                meal = Meal(id=id_, meal=name, cuisine=cuisine, price=price, difficulty=difficulty)
+                _cache_put(meal, generation)
+                return meal
+
+            # Only live meals match above, so check whether the meal exists at all
+            if conn.execute(_SQL_MEAL_NAME_EXISTS, (meal_name,)).fetchone():
+                logger.info("Meal with name %s has been deleted", meal_name)
+                raise ValueError(f"Meal with name {meal_name} has been deleted")
+            logger.info("Meal with name %s not found", meal_name)
+            raise ValueError(f"Meal with name {meal_name} not found")
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
@@ -271,28 +523,21 @@ def update_meal_stats(meal_id: int, result: str) -> None:
         sqlite3.Error: If a database error occurs during the update process.
         
     """
+    if result not in _BATTLE_RESULTS:
+        raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
+            row = conn.execute(_SQL_UPDATE_STATS, (1 if result == 'win' else 0, meal_id)).fetchone()
+
+            if row is None:
+                # Nothing was updated, so the meal is either missing or deleted
+                if conn.execute(_SQL_MEAL_EXISTS, (meal_id,)).fetchone():
                     logger.info("Meal with ID %s has been deleted", meal_id)
                     raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
                 logger.info("Meal with ID %s not found", meal_id)
                 raise ValueError(f"Meal with ID {meal_id} not found")
 
-            if result == 'win':
-                cursor.execute("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?", (meal_id,))
-            elif result == 'loss':
-                cursor.execute("UPDATE meals SET battles = battles + 1 WHERE id = ?", (meal_id,))
-            else:
-                raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
-
-            conn.commit()
-
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
         raise e
\ No newline at end of file
@@ -1,7 +1,12 @@
 from contextlib import contextmanager
 import logging
 import os
+import queue
 import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import quote
 
 from meal_max.utils.logger import configure_logger
 
@@ -13,13 +18,32 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/meal_max.db")
 
+# number of read-only connections kept open for the lifetime of the process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+
+# size of the per-connection prepared statement cache
+DB_CACHED_STATEMENTS = 256
+
+# per-connection settings, applied once when a pooled connection is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA cache_size=-64000;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=268435456;",
+    # ANALYZE samples about this many rows per index instead of reading whole tables
+    "PRAGMA analysis_limit=1000;",
+)
+
+# writes inside batched_writes() are committed together after this many writes or this many seconds
+GROUP_COMMIT_MAX_WRITES = 256
+GROUP_COMMIT_MAX_DELAY = 0.02
+
 
 def check_database_connection():
     try:
         conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
         # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
+        conn.execute("SELECT 1;")
         conn.close()
     except sqlite3.Error as e:
         error_message = f"Database connection error: {e}"
@@ -29,14 +53,105 @@ def check_database_connection():
 def check_table_exists(tablename: str):
     try:
         conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
+        conn.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
         conn.close()
     except sqlite3.Error as e:
         error_message = f"Table check error: {e}"
         logger.error(error_message)
         raise Exception(error_message) from e
 
+
+class _ConnectionPool:
+    """A fixed-size pool of SQLite connections shared by every thread in the process.
+
+    All connections are opened up front and checked out one at a time, so a pool
+    of size 1 also serializes its callers, which is how the single writer is kept.
+
+    Attributes:
+        db_path (str): The path of the SQLite database file.
+        read_only (bool): Whether the connections are opened in read-only mode.
+
+    """
+
+    def __init__(self, db_path: str, size: int, read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self._connections: queue.Queue = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            conn = sqlite3.connect(
+                f"file:{quote(self.db_path)}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=DB_CACHED_STATEMENTS,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=DB_CACHED_STATEMENTS,
+            )
+            # WAL is persistent in the file, so only the writer needs to switch it on
+            conn.execute("PRAGMA journal_mode=WAL;")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        return self._connections.get()
+
+    def put(self, conn: sqlite3.Connection) -> None:
+        # never hand a half-finished transaction to the next caller
+        if conn.in_transaction:
+            conn.rollback()
+        self._connections.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool_lock = threading.Lock()
+_write_pool: Optional[_ConnectionPool] = None
+_read_pool: Optional[_ConnectionPool] = None
+
+
+def _get_pool(read_only: bool) -> _ConnectionPool:
+    global _write_pool, _read_pool
+
+    with _pool_lock:
+        # the writer is always opened first so the database file exists and is in WAL mode
+        if _write_pool is None:
+            _write_pool = _ConnectionPool(DB_PATH, 1)
+            logger.info("Opened writer connection to %s", DB_PATH)
+        if read_only and _read_pool is None:
+            _read_pool = _ConnectionPool(DB_PATH, DB_POOL_SIZE, read_only=True)
+            logger.info("Opened %d read-only connections to %s", DB_POOL_SIZE, DB_PATH)
+    return _read_pool if read_only else _write_pool
+
+def close_db_pools() -> None:
+    """Closes every pooled connection. The pools are reopened on the next request.
+
+    """
+    global _write_pool, _read_pool
+
+    with _pool_lock:
+        for pool in (_read_pool, _write_pool):
+            if pool is not None:
+                pool.close()
+        _write_pool = None
+        _read_pool = None
+    logger.info("Database connection pools closed.")
+
 ###################################################
 #
 # This one yields rather than returns.
@@ -44,15 +159,161 @@ def check_table_exists(tablename: str):
 #
 ###################################################
 @contextmanager
-def get_db_connection():
+def get_db_connection(read_only: bool = False):
+    pool = None
     conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        batch = getattr(_thread_state, "batch", None)
+        if batch is not None and (not read_only or batch.pending()):
+            # inside batched_writes(), writes and the reads that follow them share the open group
+            yield batch.connection()
+            if not read_only:
+                batch.record_write()
+            return
+
+        pool = _get_pool(read_only)
+        conn = pool.get()
         yield conn
     except sqlite3.Error as e:
         logger.error("Database connection error: %s", str(e))
         raise e
     finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
+        if conn is not None:
+            pool.put(conn)
+
+class _WriteBatch:
+    """The writes made on one thread inside batched_writes(), committed in groups.
+
+    The writer connection is taken from the pool and a group is opened with BEGIN IMMEDIATE
+    on the first write after each commit. Committing a group returns the connection to the
+    pool, so other threads' writes only wait while a group is open.
+
+    """
+
+    def __init__(self, max_writes: int, max_delay: float):
+        self.max_writes = max_writes
+        self.max_delay = max_delay
+        self.pool: Optional[_ConnectionPool] = None
+        self.conn: Optional[sqlite3.Connection] = None
+        self.writes = 0
+        self.deadline = 0.0
+        self.after_commit: list[Callable[[], None]] = []
+
+    def pending(self) -> bool:
+        return self.conn is not None and self.conn.in_transaction
+
+    def connection(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.pool = _get_pool(False)
+            self.conn = self.pool.get()
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.writes = 0
+            self.deadline = time.monotonic() + self.max_delay
+        return self.conn
+
+    def record_write(self) -> None:
+        self.writes += 1
+        if self.writes >= self.max_writes or time.monotonic() >= self.deadline:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.conn is not None and self.conn.in_transaction:
+            self.conn.execute("COMMIT")
+            logger.debug("Group commit of %d writes", self.writes)
+        self.writes = 0
+        self.close()
+        callbacks, self.after_commit = self.after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def close(self) -> None:
+        # put() rolls back a group that was not flushed
+        if self.conn is not None:
+            self.pool.put(self.conn)
+            self.conn = None
+
+_thread_state = threading.local()
+
+@contextmanager
+def batched_writes(max_writes: int = GROUP_COMMIT_MAX_WRITES, max_delay: float = GROUP_COMMIT_MAX_DELAY):
+    """Commits the writes made on this thread inside the block in groups instead of one by one.
+
+    A group is committed once it holds max_writes writes or, on the next write, once it has
+    been open for max_delay seconds, and the last group is committed when the block exits.
+    If the block raises, the open group is rolled back; groups committed earlier are kept.
+    While a group is open, reads on this thread go through it and see its uncommitted
+    writes; otherwise they use the read-only pool. Nested blocks join the outer batch.
+
+    Args:
+        max_writes (int): The number of writes committed together.
+        max_delay (float): The number of seconds a group may stay open.
+
+    """
+    if getattr(_thread_state, "batch", None) is not None:
+        yield
+        return
+
+    batch = _WriteBatch(max_writes, max_delay)
+    _thread_state.batch = batch
+    try:
+        yield
+        batch.flush()
+    finally:
+        _thread_state.batch = None
+        batch.close()
+
+def in_batched_writes() -> bool:
+    """Returns whether the current thread is inside a batched_writes() block.
+
+    """
+    return getattr(_thread_state, "batch", None) is not None
+
+def call_after_commit(callback: Callable[[], None]) -> None:
+    """Runs a callback once the current thread's writes are committed.
+
+    Outside batched_writes() writes are committed as they are made, so the callback runs
+    right away. Inside it, the callback runs when the open group is committed and is
+    dropped if the group is rolled back.
+
+    Args:
+        callback (Callable[[], None]): The function to call.
+
+    """
+    batch = getattr(_thread_state, "batch", None)
+    if batch is None or not batch.pending():
+        callback()
+    else:
+        batch.after_commit.append(callback)
+
+@contextmanager
+def immediate_transaction(conn: sqlite3.Connection):
+    """Runs the enclosed statements in one transaction that takes the write lock up front.
+
+    The transaction is committed when the block exits normally and rolled back otherwise.
+
+    Inside batched_writes() the connection already has a transaction open, so the block
+    runs in a savepoint of it instead.
+
+    Args:
+        conn (sqlite3.Connection): An autocommit connection from get_db_connection().
+
+    """
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT immediate_transaction")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO immediate_transaction")
+            conn.execute("RELEASE immediate_transaction")
+            raise
+        conn.execute("RELEASE immediate_transaction")
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
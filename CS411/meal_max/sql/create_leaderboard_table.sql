@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS meal_leaderboard (
+    id INTEGER PRIMARY KEY,
+    meal TEXT NOT NULL,
+    cuisine TEXT NOT NULL,
+    price REAL NOT NULL,
+    difficulty TEXT NOT NULL,
+    battles INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    win_pct REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_meal_leaderboard_wins ON meal_leaderboard(wins DESC);
+CREATE INDEX IF NOT EXISTS idx_meal_leaderboard_win_pct ON meal_leaderboard(win_pct DESC);
@@ -3,9 +3,14 @@ CREATE TABLE meals (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     meal TEXT NOT NULL UNIQUE,
     cuisine TEXT NOT NULL,
-    price REAL NOT NULL,
-    difficulty TEXT CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
+    price REAL NOT NULL CHECK(price >= 0),
+    difficulty TEXT NOT NULL CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
     battles INTEGER DEFAULT 0,
     wins INTEGER DEFAULT 0,
-    deleted BOOLEAN DEFAULT FALSE
-);
\ No newline at end of file
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+-- Partial index over the meals that can appear on the leaderboard
+CREATE INDEX idx_meals_leader ON meals(deleted, battles, wins DESC) WHERE deleted = 0 AND battles > 0;
+
+-- The leaderboard snapshot is recreated empty by create_leaderboard_table.sql
+DROP TABLE IF EXISTS meal_leaderboard;
@@ -1,5 +1,7 @@
+import copy
 import os
 from contextlib import contextmanager
+import pickle
 import re
 import sqlite3
 from unittest.mock import mock_open, patch
@@ -7,18 +9,22 @@ from unittest.mock import mock_open, patch
 import pytest
 
 import meal_max
+from meal_max.models import kitchen_model
 from meal_max.models.kitchen_model import (
     Meal, 
     create_meal, 
+    create_meals_bulk,
     get_meal_by_id, 
     get_meal_by_name, 
     delete_meal, 
     update_meal_stats, 
     get_leaderboard,
+    refresh_leaderboard,
+    create_leaderboard_table,
     clear_meals
 )
 
-from meal_max.utils.sql_utils import get_db_connection
+from meal_max.utils.sql_utils import batched_writes, get_db_connection
 from meal_max.utils.logger import configure_logger
 
 ######################################################
@@ -49,24 +55,49 @@ def sample_meal2():
         difficulty="HIGH"
     )
 
+LEADERBOARD_COLUMNS = ('id', 'meal', 'cuisine', 'price', 'difficulty', 'battles', 'wins', 'win_pct')
+
+def leaderboard_rows(rows):
+    """Builds mapping rows like the sqlite3.Row objects the leaderboard query returns."""
+    return iter([dict(zip(LEADERBOARD_COLUMNS, row)) for row in rows])
+
 @pytest.fixture
 def mock_cursor(mocker):
     mock_conn = mocker.Mock()
-    mock_cursor = mocker.Mock()
+    mock_cursor = mocker.MagicMock()
 
     mock_conn.cursor.return_value = mock_cursor
+    # conn.execute() and friends are routed through the cursor mock so either call style is recorded
+    mock_conn.execute = mock_cursor.execute
+    mock_conn.executescript = mock_cursor.executescript
+    mock_conn.in_transaction = False
+    mock_cursor.execute.return_value = mock_cursor
     mock_cursor.fetchone.return_value = None
     mock_cursor.fetchall.return_value = []
+    mock_cursor.rowcount = 1
     mock_cursor.commit.return_value = None
 
     @contextmanager
-    def mock_get_db_connection():
+    def mock_get_db_connection(read_only=False):
         yield mock_conn
 
     mocker.patch('meal_max.models.kitchen_model.get_db_connection', mock_get_db_connection)
 
     return mock_cursor
 
+@pytest.fixture(autouse=True)
+def reset_create_table_script(mocker):
+    """Fixture making each test read the create table scripts afresh."""
+    mocker.patch('meal_max.models.kitchen_model._CREATE_TABLE_SCRIPT', None)
+    mocker.patch('meal_max.models.kitchen_model._CREATE_LEADERBOARD_SCRIPT', None)
+
+@pytest.fixture(autouse=True)
+def clear_meal_cache():
+    """Fixture making each test start with an empty meal cache."""
+    kitchen_model._cache_clear()
+    yield
+    kitchen_model._cache_clear()
+
 ##################################################
 # Attribute Validation Test Cases
 ##################################################
@@ -82,6 +113,17 @@ def test_negative_price_raises_value_error():
     with pytest.raises(ValueError, match="Price must be a positive value."):
         Meal(id=2, meal="Salad", cuisine="French", price=-5.00, difficulty="LOW")
 
+def test_meal_is_immutable(sample_meal1):
+    """Test that a meal's attributes cannot be reassigned after creation."""
+    with pytest.raises(AttributeError):
+        sample_meal1.price = 1.00
+
+def test_meal_copy_and_pickle(sample_meal1):
+    """Test that a meal survives copying and a pickle round trip."""
+    assert copy.copy(sample_meal1) == sample_meal1
+    assert copy.deepcopy(sample_meal1) == sample_meal1
+    assert pickle.loads(pickle.dumps(sample_meal1)) == sample_meal1
+
 def test_invalid_difficulty_raises_value_error():
     """Test that an invalid difficulty level raises a ValueError."""
     with pytest.raises(ValueError, match="Difficulty must be 'LOW', 'MED', or 'HIGH'."):
@@ -93,10 +135,15 @@ def test_invalid_difficulty_raises_value_error():
 
 def test_create_meal_success(mock_cursor):
     """Test successful meal creation."""
+    mock_cursor.fetchall.return_value = [("Manti",)]
+
     create_meal("Manti", "Turkish", 12.99, "MED")
-    
-    mock_cursor.execute.assert_called_once()
-    assert "INSERT INTO meals" in mock_cursor.execute.call_args[0][0]
+
+    statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert statements[0] == "BEGIN IMMEDIATE"
+    assert "INSERT INTO meals" in statements[1]
+    assert mock_cursor.execute.call_args_list[1][0][1] == ["Manti", "Turkish", 12.99, "MED"]
+    assert statements[-1] == "COMMIT"
 
 def test_create_meal_invalid_price():
     """Test error when creating meal with invalid price."""
@@ -110,11 +157,14 @@ def test_create_meal_invalid_difficulty():
 
 def test_create_duplicate_meal(mock_cursor):
     """Test error when creating a duplicate meal."""
-    mock_cursor.execute.side_effect = sqlite3.IntegrityError
+    mock_cursor.fetchall.return_value = []
     
     with pytest.raises(ValueError, match="Meal with name 'Manti' already exists"):
         create_meal("Manti", "Turkish", 12.99, "MED")
 
+    assert "ON CONFLICT(meal) DO NOTHING" in mock_cursor.execute.call_args_list[1][0][0]
+    assert mock_cursor.execute.call_args_list[-1][0][0] == "ROLLBACK"
+
 def test_create_meal_database_error(mock_cursor):
     """Test that a database error raises an sqlite3.Error."""
     mock_cursor.execute.side_effect = sqlite3.Error("Database error")
@@ -122,6 +172,55 @@ def test_create_meal_database_error(mock_cursor):
     with pytest.raises(sqlite3.Error, match="Database error"):
         create_meal("Pasta", "Italian", 10.99, "MED")
 
+def test_create_meals_bulk_chunks_inserts(mock_cursor):
+    """Test that a bulk insert is split into multi-row INSERTs inside one transaction."""
+    meals = [(f"Meal {i}", "Turkish", 12.99, "MED") for i in range(130)]
+    mock_cursor.fetchall.side_effect = [
+        [(meal,) for meal, *_ in meals[:125]],
+        [(meal,) for meal, *_ in meals[125:]]
+    ]
+
+    create_meals_bulk(meals)
+
+    calls = mock_cursor.execute.call_args_list
+    assert calls[0][0][0] == "BEGIN IMMEDIATE"
+    assert calls[-1][0][0] == "COMMIT"
+    inserts = calls[1:-1]
+    assert len(inserts) == 2
+    assert len(inserts[0][0][1]) == 125 * 4
+    assert len(inserts[1][0][1]) == 5 * 4
+    assert inserts[1][0][1][:4] == ["Meal 125", "Turkish", 12.99, "MED"]
+
+def test_create_meals_bulk_large_load_analyzes(mock_cursor):
+    """Test that a large bulk insert refreshes the planner statistics before committing."""
+    meals = [(f"Meal {i}", "Turkish", 12.99, "MED") for i in range(1000)]
+    mock_cursor.fetchall.side_effect = [
+        [(meal,) for meal, *_ in meals[start:start + 125]] for start in range(0, 1000, 125)
+    ]
+
+    create_meals_bulk(meals)
+
+    statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert statements[-2:] == ["ANALYZE meals", "COMMIT"]
+
+def test_create_meals_bulk_invalid_meal(mock_cursor):
+    """Test that one invalid meal rejects the whole batch before touching the database."""
+    meals = [("Manti", "Turkish", 12.99, "MED"), ("Burger", "American", 8.99, "EXTREME")]
+
+    with pytest.raises(ValueError, match="Invalid difficulty level: EXTREME"):
+        create_meals_bulk(meals)
+
+    mock_cursor.execute.assert_not_called()
+
+def test_create_meals_bulk_duplicate_rolls_back(mock_cursor):
+    """Test that a name repeated within the batch rolls back the whole batch."""
+    mock_cursor.fetchall.return_value = [("Manti",)]
+
+    with pytest.raises(ValueError, match="Meal with name 'Manti' already exists"):
+        create_meals_bulk([("Manti", "Turkish", 12.99, "MED"), ("Manti", "Turkish", 12.99, "MED")])
+
+    assert mock_cursor.execute.call_args_list[-1][0][0] == "ROLLBACK"
+
 ##################################################
 # Clear Meals Test Case
 ##################################################
@@ -147,9 +246,23 @@ def test_clear_meals(mock_cursor, mocker):
     
     clear_meals()
     
-    mock_cursor.executescript.assert_called_once_with(mock_create_table_script)
+    # builtins.open is mocked for both scripts, so the same text stands in for each
+    mock_cursor.executescript.assert_called_once_with(
+        f"BEGIN IMMEDIATE;\n{mock_create_table_script}\n{mock_create_table_script}\nCOMMIT;"
+    )
     assert mock_cursor.connection.commit.call_count == 0
 
+def test_clear_meals_reads_script_once(mock_cursor, mocker):
+    """Test that the create table scripts are only read from disk on the first call."""
+    mock_file = mocker.mock_open(read_data="DROP TABLE IF EXISTS meals;")
+    mocker.patch("builtins.open", mock_file)
+
+    clear_meals()
+    clear_meals()
+
+    assert mock_file.call_count == 2
+    assert mock_cursor.executescript.call_count == 2
+
 def test_clear_meals_empty_database(mock_cursor, mocker, caplog):
     """Test clearing meals when database is empty."""
     mock_create_table_script = """
@@ -173,7 +286,9 @@ def test_clear_meals_empty_database(mock_cursor, mocker, caplog):
     
     clear_meals()
     
-    mock_cursor.executescript.assert_called_once_with(mock_create_table_script)
+    mock_cursor.executescript.assert_called_once_with(
+        f"BEGIN IMMEDIATE;\n{mock_create_table_script}\n{mock_create_table_script}\nCOMMIT;"
+    )
     assert mock_cursor.connection.commit.call_count == 0
     assert "Meals cleared successfully." in caplog.text
 
@@ -187,13 +302,21 @@ def test_clear_meals_database_error(mock_cursor):
         with pytest.raises(sqlite3.Error, match="Database error"):
             clear_meals()
 
+def test_clear_meals_inside_batch(mock_cursor):
+    """Test that clearing meals is refused inside batched_writes()."""
+    with batched_writes():
+        with pytest.raises(RuntimeError, match="cannot be called inside batched_writes"):
+            clear_meals()
+
+    mock_cursor.executescript.assert_not_called()
+
 ##################################################
 # Meal Retrieval Test Cases
 ##################################################
 
 def test_get_meal_by_id_success(mock_cursor, sample_meal1):
     """Test successful meal retrieval by ID."""
-    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED", False)
+    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED")
     
     meal = get_meal_by_id(1)
     assert meal.id == 1
@@ -212,7 +335,7 @@ def test_get_meal_by_id_not_found(mock_cursor):
 
 def test_get_meal_by_id_deleted(mock_cursor):
     """Test retrieval of a meal that has been marked as deleted."""
-    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED", True)
+    mock_cursor.fetchone.side_effect = [None, (1,)]
 
     with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
         get_meal_by_id(1)
@@ -223,9 +346,10 @@ def test_get_meal_by_id_database_error(mocker):
     mock_cursor = mocker.Mock()
 
     mock_conn.cursor.return_value = mock_cursor
+    mock_conn.execute = mock_cursor.execute
 
     @contextmanager
-    def mock_get_db_connection():
+    def mock_get_db_connection(read_only=False):
         yield mock_conn
 
     mocker.patch('meal_max.models.kitchen_model.get_db_connection', mock_get_db_connection)
@@ -235,9 +359,39 @@ def test_get_meal_by_id_database_error(mocker):
     with pytest.raises(sqlite3.Error, match="Database error"):
         get_meal_by_id(1)
 
+def test_get_meal_by_id_cached(mock_cursor):
+    """Test that a repeated lookup by ID is served from the cache."""
+    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED")
+
+    first = get_meal_by_id(1)
+    second = get_meal_by_id(1)
+
+    assert first == second
+    mock_cursor.execute.assert_called_once()
+
+def test_get_meal_by_id_not_cached_inside_batch(mock_cursor):
+    """Test that a lookup inside batched_writes() does not fill the cache."""
+    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED")
+
+    with batched_writes():
+        get_meal_by_id(1)
+    get_meal_by_id(1)
+
+    assert mock_cursor.execute.call_count == 2
+
+def test_get_meal_by_name_cached(mock_cursor):
+    """Test that a meal cached by one lookup serves the other lookup too."""
+    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED")
+
+    get_meal_by_id(1)
+    meal = get_meal_by_name("Manti")
+
+    assert meal.id == 1
+    mock_cursor.execute.assert_called_once()
+
 def test_get_meal_by_name_success(mock_cursor, sample_meal1):
     """Test successful meal retrieval by name."""
-    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED", False)
+    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED")
 
     meal = get_meal_by_name("Manti")
     
@@ -258,7 +412,7 @@ def test_get_meal_by_name_not_found(mock_cursor):
 
 def test_get_meal_by_name_deleted(mock_cursor):
     """Test retrieval of a meal that has been marked as deleted."""
-    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED", True)
+    mock_cursor.fetchone.side_effect = [None, (1,)]
 
     with pytest.raises(ValueError, match="Meal with name Manti has been deleted"):
         get_meal_by_name("Manti")
@@ -270,9 +424,10 @@ def test_get_meal_by_name_database_error(mocker):
     mock_cursor = mocker.Mock()
 
     mock_conn.cursor.return_value = mock_cursor
+    mock_conn.execute = mock_cursor.execute
 
     @contextmanager
-    def mock_get_db_connection():
+    def mock_get_db_connection(read_only=False):
         yield mock_conn
 
     mocker.patch('meal_max.models.kitchen_model.get_db_connection', mock_get_db_connection)
@@ -288,13 +443,41 @@ def test_get_meal_by_name_database_error(mocker):
 
 def test_delete_meal_success(mock_cursor):
     """Test successful meal deletion."""
-    mock_cursor.fetchone.return_value = (False,)
-    
     delete_meal(1)
-    assert "UPDATE meals SET deleted = TRUE" in mock_cursor.execute.call_args_list[-1][0][0]
+
+    mock_cursor.execute.assert_called_once()
+    assert "UPDATE meals SET deleted = 1 WHERE id = ? AND deleted = 0" in mock_cursor.execute.call_args[0][0]
+
+def test_delete_meal_invalidates_cache(mock_cursor):
+    """Test that deleting a meal evicts it from the cache for both lookups."""
+    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED")
+    get_meal_by_id(1)
+
+    delete_meal(1)
+
+    mock_cursor.fetchone.side_effect = [None, (1,), None, (1,)]
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
+    with pytest.raises(ValueError, match="Meal with name Manti has been deleted"):
+        get_meal_by_name("Manti")
+
+def test_get_meal_by_id_not_cached_after_concurrent_delete(mock_cursor):
+    """Test that a meal deleted between the lookup's SELECT and its cache write is not cached."""
+    def delete_during_select():
+        # delete_meal() commits and invalidates the cache after the SELECT has read the row
+        kitchen_model._cache_invalidate(1)
+        return (1, "Manti", "Turkish", 12.99, "MED")
+
+    mock_cursor.fetchone.side_effect = delete_during_select
+    get_meal_by_id(1)
+
+    mock_cursor.fetchone.side_effect = [None, (1,)]
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
 
 def test_delete_meal_not_found(mock_cursor):
     """Test error when trying to delete a meal that does not exist."""
+    mock_cursor.rowcount = 0
     mock_cursor.fetchone.return_value = None
     
     with pytest.raises(ValueError, match="Meal with ID 1 not found"):
@@ -302,7 +485,8 @@ def test_delete_meal_not_found(mock_cursor):
 
 def test_delete_already_deleted_meal(mock_cursor):
     """Test error when deleting an already deleted meal."""
-    mock_cursor.fetchone.return_value = (True,)
+    mock_cursor.rowcount = 0
+    mock_cursor.fetchone.return_value = (1,)
     
     with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
         delete_meal(1)
@@ -322,21 +506,27 @@ def test_delete_meal_database_error(mock_cursor):
 
 def test_update_meal_stats_win(mock_cursor):
     """Test updating meal stats for a win."""
-    mock_cursor.fetchone.return_value = (False,)
-    
+    mock_cursor.fetchone.return_value = (1,)
+
     update_meal_stats(1, 'win')
-    assert "UPDATE meals SET battles = battles + 1, wins = wins + 1" in mock_cursor.execute.call_args_list[-1][0][0]
+
+    mock_cursor.execute.assert_called_once()
+    assert "UPDATE meals SET battles = battles + 1" in mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_args[0][1] == (1, 1)
 
 def test_update_meal_stats_loss(mock_cursor):
     """Test updating meal stats for a loss."""
-    mock_cursor.fetchone.return_value = (False,)
-    
+    mock_cursor.fetchone.return_value = (1,)
+
     update_meal_stats(1, 'loss')
-    assert "UPDATE meals SET battles = battles + 1" in mock_cursor.execute.call_args_list[-1][0][0]
+
+    mock_cursor.execute.assert_called_once()
+    assert "UPDATE meals SET battles = battles + 1" in mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_args[0][1] == (0, 1)
 
 def test_update_meal_stats_not_found(mock_cursor):
     """Test error when trying to update a non-existent meal."""
-    mock_cursor.fetchone.side_effect = TypeError
+    mock_cursor.fetchone.return_value = None
 
     with pytest.raises(ValueError, match="Meal with ID 999 not found"):
         update_meal_stats(999, 'win')
@@ -344,7 +534,7 @@ def test_update_meal_stats_not_found(mock_cursor):
 
 def test_update_meal_stats_deleted(mock_cursor):
     """Test retrieval of a meal that has been marked as deleted."""
-    mock_cursor.fetchone.return_value = (True,)
+    mock_cursor.fetchone.side_effect = [None, (1,)]
 
     with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
         update_meal_stats(1, 'win')
@@ -357,6 +547,8 @@ def test_update_meal_stats_invalid_result(mock_cursor):
     with pytest.raises(ValueError, match="Invalid result: invalid_result. Expected 'win' or 'loss'."):
         update_meal_stats(1, 'invalid_result')
 
+    mock_cursor.execute.assert_not_called()
+
 
 def test_update_meal_stats_database_error(mocker):
     """Test handling of a database error during the update process."""
@@ -364,9 +556,10 @@ def test_update_meal_stats_database_error(mocker):
     mock_cursor = mocker.Mock()
 
     mock_conn.cursor.return_value = mock_cursor
+    mock_conn.execute = mock_cursor.execute
 
     @contextmanager
-    def mock_get_db_connection():
+    def mock_get_db_connection(read_only=False):
         yield mock_conn
 
     mocker.patch('meal_max.models.kitchen_model.get_db_connection', mock_get_db_connection)
@@ -382,10 +575,10 @@ def test_update_meal_stats_database_error(mocker):
 
 def test_get_leaderboard_sorted_by_wins(mock_cursor):
     """Test retrieving the leaderboard sorted by wins."""
-    mock_cursor.fetchall.return_value = [
-        (1, "Pasta", "Italian", 10.99, "MED", 5, 4, 0.8),
-        (2, "Sushi", "Japanese", 15.99, "HIGH", 3, 3, 1.0)
-    ]
+    mock_cursor.__iter__.return_value = leaderboard_rows([
+        (1, "Pasta", "Italian", 10.99, "MED", 5, 4, 80.0),
+        (2, "Sushi", "Japanese", 15.99, "HIGH", 3, 3, 100.0)
+    ])
     
     leaderboard = get_leaderboard("wins")
     
@@ -397,10 +590,10 @@ def test_get_leaderboard_sorted_by_wins(mock_cursor):
 
 def test_get_leaderboard_sorted_by_win_pct(mock_cursor):
     """Test retrieving the leaderboard sorted by win percentage."""
-    mock_cursor.fetchall.return_value = [
-        (1, "Pasta", "Italian", 10.99, "MED", 5, 4, 0.8),
-        (2, "Sushi", "Japanese", 15.99, "HIGH", 3, 3, 1.0)
-    ]
+    mock_cursor.__iter__.return_value = leaderboard_rows([
+        (1, "Pasta", "Italian", 10.99, "MED", 5, 4, 80.0),
+        (2, "Sushi", "Japanese", 15.99, "HIGH", 3, 3, 100.0)
+    ])
     
     leaderboard = get_leaderboard("win_pct")
     
@@ -412,11 +605,11 @@ def test_get_leaderboard_sorted_by_win_pct(mock_cursor):
 
 def test_get_leaderboard_sorted_by_wins(mock_cursor):
     """Test that the leaderboard is returned correctly when sorted by wins."""
-    mock_cursor.fetchall.return_value = [
-        (1, 'Meal 1', 'Italian', 10.0, 'Easy', 5, 3, 0.6),
-        (2, 'Meal 2', 'Mexican', 12.0, 'Medium', 8, 5, 0.625),
-        (3, 'Meal 3', 'Chinese', 15.0, 'Hard', 10, 7, 0.7)
-    ]
+    mock_cursor.__iter__.return_value = leaderboard_rows([
+        (1, 'Meal 1', 'Italian', 10.0, 'Easy', 5, 3, 60.0),
+        (2, 'Meal 2', 'Mexican', 12.0, 'Medium', 8, 5, 62.5),
+        (3, 'Meal 3', 'Chinese', 15.0, 'Hard', 10, 7, 70.0)
+    ])
 
     expected_leaderboard = [
         {'id': 1, 'meal': 'Meal 1', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'Easy', 'battles': 5, 'wins': 3, 'win_pct': 60.0},
@@ -430,11 +623,11 @@ def test_get_leaderboard_sorted_by_wins(mock_cursor):
 
 def test_get_leaderboard_sorted_by_win_pct(mock_cursor):
     """Test that the leaderboard is returned correctly when sorted by win percentage."""
-    mock_cursor.fetchall.return_value = [
-        (1, 'Meal 1', 'Italian', 10.0, 'Easy', 5, 3, 0.6),
-        (2, 'Meal 2', 'Mexican', 12.0, 'Medium', 8, 5, 0.625),
-        (3, 'Meal 3', 'Chinese', 15.0, 'Hard', 10, 7, 0.7)
-    ]
+    mock_cursor.__iter__.return_value = leaderboard_rows([
+        (1, 'Meal 1', 'Italian', 10.0, 'Easy', 5, 3, 60.0),
+        (2, 'Meal 2', 'Mexican', 12.0, 'Medium', 8, 5, 62.5),
+        (3, 'Meal 3', 'Chinese', 15.0, 'Hard', 10, 7, 70.0)
+    ])
 
     expected_leaderboard = [
         {'id': 1, 'meal': 'Meal 1', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'Easy', 'battles': 5, 'wins': 3, 'win_pct': 60.0},
@@ -446,6 +639,57 @@ def test_get_leaderboard_sorted_by_win_pct(mock_cursor):
 
     assert leaderboard == expected_leaderboard
 
+def test_get_leaderboard_reads_snapshot(mock_cursor):
+    """Test that the leaderboard is read from the materialized table."""
+    get_leaderboard("win_pct")
+
+    query = mock_cursor.execute.call_args[0][0]
+    assert "FROM meal_leaderboard" in query
+    assert "ORDER BY win_pct DESC" in query
+
+def test_refresh_leaderboard(mock_cursor):
+    """Test that refreshing rebuilds the leaderboard table in one transaction."""
+    refresh_leaderboard()
+
+    statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert statements[0] == "BEGIN IMMEDIATE"
+    assert statements[1] == "DELETE FROM meal_leaderboard"
+    assert "INSERT INTO meal_leaderboard" in statements[2]
+    assert "ROUND(wins * 100.0 / battles, 1)" in statements[2]
+    assert statements[3] == "COMMIT"
+
+def test_create_leaderboard_table(mock_cursor, mocker):
+    """Test that the leaderboard table is created from its script in one transaction."""
+    mock_create_leaderboard_script = "CREATE TABLE IF NOT EXISTS meal_leaderboard (id INTEGER PRIMARY KEY);"
+    mocker.patch("builtins.open", mocker.mock_open(read_data=mock_create_leaderboard_script))
+
+    create_leaderboard_table()
+
+    mock_cursor.executescript.assert_called_once_with(f"BEGIN IMMEDIATE;\n{mock_create_leaderboard_script}\nCOMMIT;")
+
+def test_refresh_leaderboard_database_error(mock_cursor):
+    """Test that a failed refresh is rolled back and raises an sqlite3.Error."""
+    mock_cursor.execute.side_effect = [None, sqlite3.Error("Database error"), None]
+
+    with pytest.raises(sqlite3.Error, match="Database error"):
+        refresh_leaderboard()
+
+    assert mock_cursor.execute.call_args_list[-1][0][0] == "ROLLBACK"
+
+def test_get_leaderboard_paginated(mock_cursor):
+    """Test that limit and offset are bound into the leaderboard query."""
+    get_leaderboard("wins", limit=10, offset=20)
+
+    # Ties are broken by id so that pages do not overlap or skip meals
+    assert "ORDER BY wins DESC, id" in mock_cursor.execute.call_args[0][0]
+    assert "LIMIT ? OFFSET ?" in mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_args[0][1] == (10, 20)
+
+def test_get_leaderboard_invalid_page(mock_cursor):
+    """Test error when getting leaderboard with a negative limit."""
+    with pytest.raises(ValueError, match="Invalid leaderboard page"):
+        get_leaderboard("wins", limit=-1)
+
 def test_get_leaderboard_invalid_sort(mock_cursor):
     """Test error when getting leaderboard with invalid sort parameter."""
     with pytest.raises(ValueError, match="Invalid sort_by parameter: invalid"):
@@ -453,7 +697,7 @@ def test_get_leaderboard_invalid_sort(mock_cursor):
 
 def test_get_leaderboard_database_error(mock_cursor):
     """Test that a database error raises an sqlite3.Error."""
-    mock_cursor.fetchall.side_effect = sqlite3.Error("Database error")
+    mock_cursor.execute.side_effect = sqlite3.Error("Database error")
     
     with pytest.raises(sqlite3.Error, match="Database error"):
         get_leaderboard("wins")
\ No newline at end of file
@@ -0,0 +1,214 @@
+import sqlite3
+import threading
+
+import pytest
+
+from meal_max.utils import sql_utils
+from meal_max.utils.sql_utils import batched_writes, call_after_commit, close_db_pools, get_db_connection, immediate_transaction
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Fixture pointing the connection pools at a fresh database file."""
+    path = str(tmp_path / "meal_max.db")
+    monkeypatch.setattr(sql_utils, "DB_PATH", path)
+    monkeypatch.setattr(sql_utils, "DB_POOL_SIZE", 2)
+    close_db_pools()
+    yield path
+    close_db_pools()
+
+##################################################
+# Connection Pool Test Cases
+##################################################
+
+def test_get_db_connection_reuses_writer(db_path):
+    """Test that consecutive writes are served by the same pooled connection."""
+    with get_db_connection() as conn:
+        first = conn
+    with get_db_connection() as conn:
+        second = conn
+
+    assert first is second
+
+def test_get_db_connection_applies_pragmas(db_path):
+    """Test that pooled connections are opened in WAL mode with relaxed syncing."""
+    with get_db_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+
+def test_read_only_connection_sees_writes(db_path):
+    """Test that the read pool sees rows written through the writer."""
+    with get_db_connection() as conn:
+        conn.execute("CREATE TABLE meals (id INTEGER PRIMARY KEY, meal TEXT)")
+        conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+
+    with get_db_connection(read_only=True) as conn:
+        assert conn.execute("SELECT meal FROM meals").fetchone()["meal"] == "Manti"
+
+def test_read_only_connection_rejects_writes(db_path):
+    """Test that a connection from the read pool cannot modify the database."""
+    with get_db_connection() as conn:
+        conn.execute("CREATE TABLE meals (id INTEGER PRIMARY KEY, meal TEXT)")
+
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        with get_db_connection(read_only=True) as conn:
+            conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+
+def test_open_transaction_rolled_back_on_return(db_path):
+    """Test that a connection is returned to the pool without a pending transaction."""
+    with get_db_connection() as conn:
+        conn.execute("CREATE TABLE meals (id INTEGER PRIMARY KEY, meal TEXT)")
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+
+    with get_db_connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0] == 0
+
+
+@pytest.fixture
+def meals_table(db_path):
+    """Fixture creating a minimal meals table in the pooled database."""
+    with get_db_connection() as conn:
+        conn.execute("CREATE TABLE meals (id INTEGER PRIMARY KEY, meal TEXT UNIQUE)")
+    return db_path
+
+def count_committed_meals(db_path):
+    """Counts the meals visible to a connection outside the pools."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0]
+    finally:
+        conn.close()
+
+##################################################
+# Group Commit Test Cases
+##################################################
+
+def test_batched_writes_commits_on_exit(meals_table):
+    """Test that writes inside a batch are only committed when the block exits."""
+    with batched_writes(max_delay=60):
+        for name in ("Manti", "Pide", "Baklava"):
+            with get_db_connection() as conn:
+                conn.execute("INSERT INTO meals (meal) VALUES (?)", (name,))
+        assert count_committed_meals(meals_table) == 0
+
+        with get_db_connection(read_only=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0] == 3, "Reads should see the batch's own writes"
+
+    assert count_committed_meals(meals_table) == 3
+
+def test_batched_writes_commits_at_max_writes(meals_table):
+    """Test that a group is committed once it holds max_writes writes."""
+    with batched_writes(max_writes=2, max_delay=60):
+        for name in ("Manti", "Pide", "Baklava"):
+            with get_db_connection() as conn:
+                conn.execute("INSERT INTO meals (meal) VALUES (?)", (name,))
+        assert count_committed_meals(meals_table) == 2
+
+    assert count_committed_meals(meals_table) == 3
+
+def test_batched_writes_commits_after_max_delay(meals_table):
+    """Test that a group open for longer than max_delay is committed on the next write."""
+    with batched_writes(max_delay=0):
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+        assert count_committed_meals(meals_table) == 1
+
+def test_batched_writes_rolls_back_open_group(meals_table):
+    """Test that an exception rolls back the open group but keeps committed ones."""
+    with pytest.raises(RuntimeError):
+        with batched_writes(max_writes=1, max_delay=60):
+            with get_db_connection() as conn:
+                conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+            with get_db_connection() as conn:
+                conn.execute("INSERT INTO meals (meal) VALUES ('Pide')")
+                raise RuntimeError("boom")
+
+    assert count_committed_meals(meals_table) == 1
+
+    with get_db_connection() as conn:
+        assert not conn.in_transaction, "The writer should be back in the pool without a transaction"
+
+def test_immediate_transaction_inside_batch(meals_table):
+    """Test that a failed immediate_transaction inside a batch only undoes its own writes."""
+    with batched_writes(max_delay=60):
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+        with pytest.raises(sqlite3.IntegrityError):
+            with get_db_connection() as conn:
+                with immediate_transaction(conn):
+                    conn.execute("INSERT INTO meals (meal) VALUES ('Pide')")
+                    conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+
+    with get_db_connection(read_only=True) as conn:
+        assert [row["meal"] for row in conn.execute("SELECT meal FROM meals")] == ["Manti"]
+
+def test_batched_writes_reads_before_first_write_use_read_pool(meals_table):
+    """Test that a read inside a batch with no open group neither takes the write lock nor uses the writer."""
+    with batched_writes(max_delay=60):
+        with get_db_connection(read_only=True) as conn:
+            conn.execute("SELECT COUNT(*) FROM meals").fetchone()
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+
+        # Another connection can still write, so no write lock is held
+        other = sqlite3.connect(meals_table, timeout=0)
+        try:
+            other.execute("INSERT INTO meals (meal) VALUES ('Pide')")
+            other.commit()
+        finally:
+            other.close()
+
+def test_call_after_commit_runs_on_group_commit(meals_table):
+    """Test that callbacks registered in a batch run when its group is committed."""
+    calls = []
+    with batched_writes(max_delay=60):
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+            call_after_commit(lambda: calls.append("Manti"))
+        assert calls == []
+
+    assert calls == ["Manti"]
+
+def test_call_after_commit_dropped_on_rollback(meals_table):
+    """Test that callbacks registered in a rolled back group never run."""
+    calls = []
+    with pytest.raises(RuntimeError):
+        with batched_writes(max_delay=60):
+            with get_db_connection() as conn:
+                conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+                call_after_commit(lambda: calls.append("Manti"))
+            raise RuntimeError("boom")
+
+    assert calls == []
+
+def test_call_after_commit_outside_batch_runs_immediately(meals_table):
+    """Test that a callback registered outside a batch runs right away."""
+    calls = []
+    call_after_commit(lambda: calls.append("Manti"))
+
+    assert calls == ["Manti"]
+
+def test_batched_writes_releases_writer_after_group_commit(meals_table):
+    """Test that another thread can write once a group is committed, before the block exits."""
+    def write_pide():
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO meals (meal) VALUES ('Pide')")
+
+    with batched_writes(max_writes=1, max_delay=60):
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO meals (meal) VALUES ('Manti')")
+
+        writer = threading.Thread(target=write_pide, daemon=True)
+        writer.start()
+        writer.join(timeout=5)
+        assert not writer.is_alive(), "The writer connection should be back in the pool"
+
+    assert count_committed_meals(meals_table) == 2